@@ -3,27 +3,27 @@ from src.depth_analysis import (
     DimensionCalculator,
     RoughnessEstimator,
     depth_img_read,
-    preprocess_depth_img
+    preprocess_depth_img,
+    analyze_detections
 )
 import cv2
 import argparse
+import os
 
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
 
-def main(args):
+
+def analyze_image(img, detections, depth_path, dim_calc, roughness_est):
     """
-    Main function for MiC object detection and depth analysis
-    :param args: Command line arguments
+    Print depth analysis results for the detections of one image
+    :param img: Original image array
+    :param detections: Detection results
+    :param depth_path: Path to the matching depth image file
+    :param dim_calc: DimensionCalculator instance
+    :param roughness_est: RoughnessEstimator instance
     """
-    # Initialize core modules
-    detector = YOLOv12Detector()
-    dim_calc = DimensionCalculator()
-    roughness_est = RoughnessEstimator()
-
-    # Perform detection
-    img, detections = detector.detect(args.image_path)
-
     # Process depth image
-    depth_img = depth_img_read(args.depth_path)
+    depth_img = depth_img_read(depth_path)
     depth_img, _ = preprocess_depth_img(depth_img)
 
     # Print analysis results
@@ -31,34 +31,101 @@ def main(args):
     print("MiC Object Detection & Analysis Results")
     print("=" * 50)
 
-    for i, det in enumerate(detections, 1):
-        bbox = det["bbox"]
-        cls_name = det["class_name"]
-        conf = det["confidence"]
-
-        # Calculate object dimensions
-        width, height, depth = dim_calc.calculate_dimensions(depth_img, bbox)
-        # Estimate surface roughness
-        roughness = roughness_est.estimate_roughness(depth_img, bbox)
+    # Calculate dimensions and surface roughness of all objects
+    analyses = analyze_detections(depth_img, detections.bboxes, dim_calc, roughness_est)
 
+    for i, (cls_name, conf, analysis) in enumerate(
+        zip(detections.class_names, detections.confidences.tolist(), analyses), 1
+    ):
         print(f"Object {i}:")
         print(f"  Class: {cls_name} (Confidence: {conf:.2f})")
-        print(f"  Dimensions: Width={width:.3f}m, Height={height:.3f}m, Depth={depth:.3f}m")
-        print(f"  Surface Roughness: {roughness:.3f}")
+        print(f"  Dimensions: Width={analysis['width']:.3f}m, Height={analysis['height']:.3f}m, "
+              f"Depth={analysis['depth']:.3f}m")
+        print(f"  Surface Roughness: {analysis['roughness']:.3f}")
         print("-" * 30)
 
-    # Save result image
-    img_with_boxes = detector.draw_detections(img, detections)
-    cv2.imwrite(args.output_path, img_with_boxes)
-    print(f"Result image saved to: {args.output_path}")
+
+def find_image_pairs(image_dir, depth_dir):
+    """
+    Match RGB images with depth images of the same file stem
+    :param image_dir: Directory containing RGB images
+    :param depth_dir: Directory containing depth images
+    :return: List of (image path, depth path) tuples
+    """
+    depth_files = {
+        os.path.splitext(name)[0]: os.path.join(depth_dir, name)
+        for name in os.listdir(depth_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    }
+
+    pairs = []
+    for name in sorted(os.listdir(image_dir)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        stem = os.path.splitext(name)[0]
+        if stem not in depth_files:
+            print(f"Skipping {name}: no matching depth image in {depth_dir}")
+            continue
+        pairs.append((os.path.join(image_dir, name), depth_files[stem]))
+
+    return pairs
+
+
+def main(args):
+    """
+    Main function for MiC object detection and depth analysis
+    :param args: Command line arguments
+    """
+    # Initialize core modules
+    detector = YOLOv12Detector()
+    dim_calc = DimensionCalculator()
+    roughness_est = RoughnessEstimator()
+
+    if not os.path.isdir(args.image_path):
+        # Perform detection
+        img, detections = detector.detect(args.image_path)
+        analyze_image(img, detections, args.depth_path, dim_calc, roughness_est)
+
+        # Save result image
+        img_with_boxes = detector.draw_detections(img, detections)
+        output_path = args.output_path or "result.jpg"
+        cv2.imwrite(output_path, img_with_boxes)
+        print(f"Result image saved to: {output_path}")
+        return
+
+    # Directory mode: depth_path and output_path are directories as well
+    pairs = find_image_pairs(args.image_path, args.depth_path)
+    output_dir = args.output_path or "results"
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Perform batched detection, processing each batch before reading the next one
+    batch_results = detector.iter_detect_batch([image_path for image_path, _ in pairs])
+
+    for (image_path, depth_path), (img, detections) in zip(pairs, batch_results):
+        print(f"Image: {image_path}")
+        analyze_image(img, detections, depth_path, dim_calc, roughness_est)
+
+        # Save result image
+        img_with_boxes = detector.draw_detections(img, detections)
+        output_name = f"{os.path.splitext(os.path.basename(image_path))[0]}_result.jpg"
+        output_path = os.path.join(output_dir, output_name)
+        cv2.imwrite(output_path, img_with_boxes)
+        print(f"Result image saved to: {output_path}")
 
 
 if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="MiC Object Detection and Depth Analysis")
-    parser.add_argument("--image_path", type=str, required=True, help="Path to RGB image file")
-    parser.add_argument("--depth_path", type=str, required=True, help="Path to depth image file")
-    parser.add_argument("--output_path", type=str, default="result.jpg", help="Path to save result image")
+    parser.add_argument("--image_path", type=str, required=True,
+                        help="Path to RGB image file, or directory of RGB images")
+    parser.add_argument("--depth_path", type=str, required=True,
+                        help="Path to depth image file, or directory of depth images (matched by file name)")
+    parser.add_argument("--output_path", type=str, default=None,
+                        help="Path to save result image (default: result.jpg), "
+                             "or output directory in directory mode (default: results)")
 
     args = parser.parse_args()
-    main(args)
\ No newline at end of file
+    # Single-pair mode needs two files, directory mode needs two directories
+    if os.path.isdir(args.image_path) != os.path.isdir(args.depth_path):
+        parser.error("--image_path and --depth_path must both be files or both be directories")
+    main(args)
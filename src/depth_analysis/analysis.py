@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from .dimension_calc import DimensionCalculator
+from .roughness_est import RoughnessEstimator
+from .roi import ROI
+import numpy as np
+import os
+
+# Shared by all calls (and Flask request threads) so concurrent images don't each spawn a pool;
+# kept small because OpenCV runs its own filters on an internal thread pool as well
+ANALYSIS_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_analysis_pool = ThreadPoolExecutor(max_workers=ANALYSIS_MAX_WORKERS)
+
+
+def analyze_detections(
+    depth_img: np.ndarray,
+    bboxes: np.ndarray,
+    dim_calc: DimensionCalculator,
+    roughness_est: RoughnessEstimator
+) -> list:
+    """
+    Calculate dimensions and roughness for every detected object
+    :param depth_img: Preprocessed depth image array
+    :param bboxes: Bounding boxes array (n, 4) in xyxy format
+    :param dim_calc: DimensionCalculator instance
+    :param roughness_est: RoughnessEstimator instance
+    :return: List of dicts with width, height, depth and roughness (same order as bboxes)
+    """
+    def analyze(bbox: list) -> dict:
+        # Extract the ROI and its valid-pixel statistics once, shared by both analyzers
+        roi = ROI.from_bbox(depth_img, bbox)
+        # Calculate object dimensions
+        width, height, depth = dim_calc.compute(roi)
+        # Estimate surface roughness
+        roughness = roughness_est.compute(roi)
+        return {"width": width, "height": height, "depth": depth, "roughness": roughness}
+
+    bbox_list = np.asarray(bboxes).tolist()
+    if len(bbox_list) <= 1:
+        return [analyze(bbox) for bbox in bbox_list]
+
+    # Objects are independent and OpenCV/NumPy release the GIL, so analyze them in parallel
+    return list(_analysis_pool.map(analyze, bbox_list))
@@ -1,5 +1,6 @@
 import cv2
 import numpy as np
+from src.utils.image_utils import read_image
 
 
 def depth_img_read(depth_path: str) -> np.ndarray:
@@ -8,7 +9,7 @@ def depth_img_read(depth_path: str) -> np.ndarray:
     :param depth_path: Path to depth image file
     :return: Depth image array
     """
-    depth_img = cv2.imread(depth_path, cv2.IMREAD_UNCHANGED)
+    depth_img = read_image(depth_path, cv2.IMREAD_UNCHANGED)
     if depth_img is None:
         raise ValueError(f"Failed to read depth image from: {depth_path}")
     return depth_img
@@ -16,13 +17,11 @@ def depth_img_read(depth_path: str) -> np.ndarray:
 
 def preprocess_depth_img(depth_img: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """
-    Preprocess depth image: denoising and normalization
+    Preprocess depth image: normalization for visualization
+    (median denoising is applied per object ROI, see ROI.from_bbox)
     :param depth_img: Raw depth image array
-    :return: (processed depth image, normalized depth image for visualization)
+    :return: (depth image for analysis, normalized depth image for visualization)
     """
-    # Median filtering for denoising
-    depth_img = cv2.medianBlur(depth_img, 3)
-
     # Normalize to 0-255 for visualization
     depth_normalized = cv2.normalize(
         depth_img, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U
@@ -1,14 +1,42 @@
+from src.utils.path_utils import load_config, get_config_path
+from .roi import ROI
+import logging
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# Focal length (pixels) used when none is given or configured
+DEFAULT_FOCAL_LENGTH = 600
+
 
 class DimensionCalculator:
-    def __init__(self, depth_scale: float = 0.001):
+    def __init__(self, depth_scale: float = 0.001, fx: float = None, fy: float = None):
         """
         Initialize dimension calculator for depth image analysis
         :param depth_scale: Depth scale factor (convert pixel value to meters)
+        :param fx: Focal length in x direction (pixels), read from model config if None
+        :param fy: Focal length in y direction (pixels), read from model config if None
         """
         self.depth_scale = depth_scale
 
+        # Camera intrinsic parameters (600 px if neither given nor configured)
+        if fx is None or fy is None:
+            try:
+                model_config = load_config("model")
+            except FileNotFoundError:
+                model_config = {}
+            if (fx is None and "fx" not in model_config) or (fy is None and "fy" not in model_config):
+                logger.warning("fx/fy not found in model config (%s), using default focal length of %d px",
+                               get_config_path("model"), DEFAULT_FOCAL_LENGTH)
+            fx = model_config.get("fx", DEFAULT_FOCAL_LENGTH) if fx is None else fx
+            fy = model_config.get("fy", DEFAULT_FOCAL_LENGTH) if fy is None else fy
+        self.fx = fx
+        self.fy = fy
+
+        # Precompute raw depth -> physical size factors
+        self._scale_x = self.depth_scale / self.fx
+        self._scale_y = self.depth_scale / self.fy
+
     def calculate_dimensions(self, depth_img: np.ndarray, bbox: list) -> tuple[float, float, float]:
         """
         Calculate physical dimensions of detected object from depth image
@@ -16,27 +44,23 @@ class DimensionCalculator:
         :param bbox: Bounding box [x1, y1, x2, y2]
         :return: (width, height, depth) in meters
         """
-        x1, y1, x2, y2 = bbox
-        # Extract ROI from depth image
-        roi_depth = depth_img[y1:y2, x1:x2]
-        # Filter out invalid depth values (0 or negative)
-        valid_depth = roi_depth[roi_depth > 0]
+        return self.compute(ROI.from_bbox(depth_img, bbox))
 
-        if len(valid_depth) == 0:
+    def compute(self, roi: ROI) -> tuple[float, float, float]:
+        """
+        Calculate physical dimensions of detected object from a prepared depth ROI
+        :param roi: Depth ROI of the object
+        :return: (width, height, depth) in meters
+        """
+        if roi.valid_count == 0:
             return 0.0, 0.0, 0.0
 
-        # Calculate average depth (distance to camera)
-        avg_depth = np.mean(valid_depth) * self.depth_scale
-
-        # Convert pixel dimensions to physical dimensions (camera intrinsic parameters)
-        fx = 600  # Focal length in x direction
-        fy = 600  # Focal length in y direction
-
-        # Calculate physical width and height
-        pixel_width = x2 - x1
-        real_width = (pixel_width * avg_depth) / fx
+        # Calculate average raw depth (distance to camera)
+        avg_depth_raw = roi.sum_ / roi.valid_count
 
-        pixel_height = y2 - y1
-        real_height = (pixel_height * avg_depth) / fy
+        # Convert pixel dimensions to physical dimensions (pinhole camera model)
+        x1, y1, x2, y2 = roi.bbox
+        real_width = (x2 - x1) * avg_depth_raw * self._scale_x
+        real_height = (y2 - y1) * avg_depth_raw * self._scale_y
 
-        return real_width, real_height, avg_depth
\ No newline at end of file
+        return real_width, real_height, avg_depth_raw * self.depth_scale
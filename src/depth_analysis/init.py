@@ -1,3 +1,5 @@
 from .dimension_calc import DimensionCalculator
 from .roughness_est import RoughnessEstimator
-from .depth_utils import depth_img_read, preprocess_depth_img
\ No newline at end of file
+from .roi import ROI
+from .depth_utils import depth_img_read, preprocess_depth_img
+from .analysis import analyze_detections
\ No newline at end of file
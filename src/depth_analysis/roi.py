@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+import cv2
+import numpy as np
+
+
+@dataclass
+class ROI:
+    """Depth region (float32) of one detected object, with its valid-pixel statistics computed once"""
+    bbox: list
+    depth: np.ndarray
+    mask: np.ndarray
+    valid_count: int
+    sum_: float
+
+    @classmethod
+    def from_bbox(cls, depth_img: np.ndarray, bbox: list) -> "ROI":
+        """
+        Extract and denoise ROI from depth image and compute its valid-pixel statistics
+        :param depth_img: Depth image array
+        :param bbox: Bounding box [x1, y1, x2, y2]
+        :return: ROI instance
+        """
+        x1, y1, x2, y2 = bbox
+        depth = depth_img[y1:y2, x1:x2]
+        # Median filtering for denoising (only the pixels covered by the object)
+        if depth.size > 0:
+            depth = cv2.medianBlur(depth, 3)
+        # Convert once to float32 so the OpenCV filters downstream run their native float path
+        depth = depth.astype(np.float32)
+        # Mask out invalid depth values (0 or negative)
+        mask = depth > 0
+        valid_count = int(np.count_nonzero(mask))
+        sum_ = float(depth.sum(where=mask, dtype=np.float64)) if valid_count else 0.0
+        return cls(bbox=bbox, depth=depth, mask=mask, valid_count=valid_count, sum_=sum_)
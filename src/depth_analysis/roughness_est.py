@@ -1,8 +1,12 @@
+from .roi import ROI
 import numpy as np
 import cv2
 
 
 class RoughnessEstimator:
+    # ROIs at least this large are filtered through OpenCL (cv2.UMat) when a device is available
+    UMAT_MIN_AREA = 128 * 128
+
     def estimate_roughness(self, depth_img: np.ndarray, bbox: list, window_size: int = 5) -> float:
         """
         Estimate surface roughness from depth image texture
@@ -11,23 +15,89 @@ class RoughnessEstimator:
         :param window_size: Sliding window size for local variance calculation
         :return: Roughness value (higher = rougher)
         """
-        x1, y1, x2, y2 = bbox
-        # Extract ROI from depth image
-        roi_depth = depth_img[y1:y2, x1:x2]
-        # Filter out invalid depth values
-        roi_depth = roi_depth[roi_depth > 0]
+        return self.compute(ROI.from_bbox(depth_img, bbox), window_size)
 
-        if len(roi_depth) == 0:
+    def compute(self, roi: ROI, window_size: int = 5) -> float:
+        """
+        Estimate surface roughness from a prepared depth ROI
+        :param roi: Depth ROI of the object
+        :param window_size: Sliding window size for local variance calculation
+        :return: Roughness value (higher = rougher)
+        """
+        # Skip ROIs without any valid depth values
+        if roi.valid_count == 0:
             return 0.0
 
-        # Reshape to 2D array
-        roi_depth = roi_depth.reshape((y2 - y1, x2 - x1))
+        roi_f32 = roi.depth.astype(np.float32, copy=False)
+        mask_f32 = roi.mask.astype(np.float32)
+        if roi_f32.size >= self.UMAT_MIN_AREA and cv2.ocl.useOpenCL():
+            var = self._local_variance_umat(roi_f32, mask_f32, window_size)
+        else:
+            var = self._local_variance(roi_f32, mask_f32, window_size)
+
+        # Average variance over valid pixels as roughness value
+        roughness = float(var.sum(where=roi.mask, dtype=np.float64) / roi.valid_count)
+        return roughness
+
+    @staticmethod
+    def _local_variance(roi: np.ndarray, mask: np.ndarray, window_size: int) -> np.ndarray:
+        """
+        Calculate local variance of valid depth values over sliding windows using integral images
+        :param roi: 2D float32 depth ROI
+        :param mask: 2D float32 validity mask of roi (1 = valid depth, 0 = invalid)
+        :param window_size: Sliding window size
+        :return: Local variance array with the same shape as roi (0 where a window has no valid pixel)
+        """
+        h, w = roi.shape
+        k = window_size
+
+        # Pad the borders the same way cv2.boxFilter does, so every pixel has a full window
+        pad = k // 2
+        border = (pad, k - 1 - pad, pad, k - 1 - pad)
+        padded = cv2.copyMakeBorder(roi * mask, *border, cv2.BORDER_REFLECT_101)
+        padded_mask = cv2.copyMakeBorder(mask, *border, cv2.BORDER_REFLECT_101)
+
+        # Sum and sum of squares of valid values, and valid pixel counts
+        # (float64 to keep squared depth values exact; (x*m)^2 = x^2*m since m is 0/1)
+        sum_, sqsum = cv2.integral2(padded, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+        count = cv2.integral(padded_mask, sdepth=cv2.CV_64F)
+
+        # Window sums in O(1) per pixel, independent of window size
+        s = sum_[k:k + h, k:k + w] - sum_[:h, k:k + w] - sum_[k:k + h, :w] + sum_[:h, :w]
+        sq = sqsum[k:k + h, k:k + w] - sqsum[:h, k:k + w] - sqsum[k:k + h, :w] + sqsum[:h, :w]
+        n = count[k:k + h, k:k + w] - count[:h, k:k + w] - count[k:k + h, :w] + count[:h, :w]
+
+        # Windows without valid pixels have s = sq = 0, so they get variance 0
+        np.maximum(n, 1, out=n)
+        mean = s / n
+        var = sq / n - mean * mean
+        # Clip small negative values caused by floating point error
+        np.maximum(var, 0, out=var)
+        return var
+
+    @staticmethod
+    def _local_variance_umat(roi: np.ndarray, mask: np.ndarray, window_size: int) -> np.ndarray:
+        """
+        Calculate local variance of valid depth values over sliding windows with OpenCL box filters
+        :param roi: 2D float32 depth ROI
+        :param mask: 2D float32 validity mask of roi (1 = valid depth, 0 = invalid)
+        :param window_size: Sliding window size
+        :return: Local variance array with the same shape as roi (0 where a window has no valid pixel)
+        """
+        ksize = (window_size, window_size)
+        # Remove the mean of valid pixels first (variance is shift invariant) to limit float32 cancellation
+        shift = np.float32(roi.sum(where=mask > 0, dtype=np.float64) / mask.sum(dtype=np.float64))
+        masked = cv2.UMat((roi - shift) * mask)
+        mask_umat = cv2.UMat(mask)
+
+        s = cv2.boxFilter(masked, cv2.CV_32F, ksize, normalize=False)
+        sq = cv2.boxFilter(cv2.multiply(masked, masked), cv2.CV_32F, ksize, normalize=False)
+        n = cv2.boxFilter(mask_umat, cv2.CV_32F, ksize, normalize=False)
 
-        # Calculate local variance (core roughness metric)
-        kernel = np.ones((window_size, window_size), np.float32) / (window_size ** 2)
-        mean = cv2.filter2D(roi_depth, -1, kernel)
-        var = cv2.filter2D((roi_depth - mean) ** 2, -1, kernel)
+        # cv2.divide yields 0 where a window has no valid pixels
+        mean = cv2.divide(s, n)
+        var = cv2.subtract(cv2.divide(sq, n), cv2.multiply(mean, mean)).get()
 
-        # Average variance as roughness value
-        roughness = np.mean(var)
-        return roughness
\ No newline at end of file
+        # Clip small negative values caused by floating point error
+        np.maximum(var, 0, out=var)
+        return var
@@ -1,14 +1,57 @@
 import numpy as np
 
+try:
+    import numba
+except ImportError:
+    numba = None
 
-def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> list:
+
+def non_max_suppression(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    score_threshold: float = None
+) -> list:
     """
     Apply Non-Maximum Suppression to filter overlapping bounding boxes
     :param boxes: Bounding boxes array (n, 4) in xyxy format
     :param scores: Confidence scores array (n,)
     :param iou_threshold: IOU threshold for suppression
+    :param score_threshold: Boxes scoring below this are dropped before NMS (None keeps all)
+    :return: Indices of kept boxes
+    """
+    # Drop low-confidence boxes first so the pairwise loop only sees candidates
+    orig_idx = None
+    if score_threshold is not None:
+        mask = scores >= score_threshold
+        orig_idx = np.nonzero(mask)[0]
+        boxes = boxes[mask]
+        scores = scores[mask]
+
+    # Use the compiled kernel when numba is available
+    if numba is not None:
+        boxes = np.ascontiguousarray(boxes, dtype=np.float64)
+        scores = np.ascontiguousarray(scores, dtype=np.float64)
+        keep = _nms_numba(boxes, scores, float(iou_threshold)).tolist()
+    else:
+        keep = _nms_numpy(boxes, scores, iou_threshold)
+
+    # Map indices back to the unfiltered arrays
+    if orig_idx is not None:
+        keep = orig_idx[keep].tolist()
+    return keep
+
+
+def _nms_numpy(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> list:
+    """
+    NumPy implementation of Non-Maximum Suppression
+    :param boxes: Bounding boxes array (n, 4) in xyxy format
+    :param scores: Confidence scores array (n,)
+    :param iou_threshold: IOU threshold for suppression
     :return: Indices of kept boxes
     """
+    # Calculate all box areas once
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
     indices = np.argsort(scores)[::-1]
     keep = []
 
@@ -19,14 +62,70 @@ def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: fl
         if len(indices) == 1:
             break
 
-        # Calculate IOU between current box and remaining boxes
-        iou = compute_iou(boxes[current], boxes[indices[1:]])
-        # Keep boxes with IOU below threshold
-        indices = indices[1:][iou < iou_threshold]
+        rest = indices[1:]
+        box = boxes[current]
+        others = boxes[rest]
+
+        # Calculate intersection between current box and remaining boxes
+        w = np.maximum(0, np.minimum(box[2], others[:, 2]) - np.maximum(box[0], others[:, 0]))
+        h = np.maximum(0, np.minimum(box[3], others[:, 3]) - np.maximum(box[1], others[:, 1]))
+        intersection = w * h
+
+        # Keep boxes with IOU below threshold (compared as inter < thr * union, no division)
+        union = areas[current] + areas[rest] - intersection
+        indices = rest[intersection < iou_threshold * union]
 
     return keep
 
 
+def _nms_kernel(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Scalar-loop implementation of Non-Maximum Suppression (compiled with numba)
+    :param boxes: Bounding boxes array (n, 4) in xyxy format, float64
+    :param scores: Confidence scores array (n,), float64
+    :param iou_threshold: IOU threshold for suppression
+    :return: Indices of kept boxes
+    """
+    n = boxes.shape[0]
+    order = np.argsort(scores)[::-1]
+    suppressed = np.zeros(n, dtype=np.bool_)
+    keep = np.empty(n, dtype=np.int64)
+    num_keep = 0
+
+    for i in range(n):
+        current = order[i]
+        if suppressed[current]:
+            continue
+        keep[num_keep] = current
+        num_keep += 1
+
+        cx1 = boxes[current, 0]
+        cy1 = boxes[current, 1]
+        cx2 = boxes[current, 2]
+        cy2 = boxes[current, 3]
+        area_current = (cx2 - cx1) * (cy2 - cy1)
+
+        for j in range(i + 1, n):
+            other = order[j]
+            if suppressed[other]:
+                continue
+
+            # Inline IOU test (compared as inter < thr * union, no division)
+            w = min(cx2, boxes[other, 2]) - max(cx1, boxes[other, 0])
+            h = min(cy2, boxes[other, 3]) - max(cy1, boxes[other, 1])
+            intersection = max(0.0, w) * max(0.0, h)
+            area_other = (boxes[other, 2] - boxes[other, 0]) * (boxes[other, 3] - boxes[other, 1])
+            union = area_current + area_other - intersection
+            if not intersection < iou_threshold * union:
+                suppressed[other] = True
+
+    return keep[:num_keep]
+
+
+if numba is not None:
+    _nms_numba = numba.njit(cache=True, fastmath=True)(_nms_kernel)
+
+
 def compute_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
     """
     Calculate IOU between one box and multiple boxes
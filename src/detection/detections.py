@@ -0,0 +1,14 @@
+from dataclasses import dataclass, field
+import numpy as np
+
+
+@dataclass
+class Detections:
+    """Detection results of one image, stored as arrays with one row per object"""
+    bboxes: np.ndarray = field(default_factory=lambda: np.zeros((0, 4), dtype=np.int32))  # (N, 4) xyxy
+    class_ids: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))  # (N,)
+    confidences: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))  # (N,)
+    class_names: list = field(default_factory=list)  # N class name strings
+
+    def __len__(self) -> int:
+        return len(self.class_ids)
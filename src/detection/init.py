@@ -1,2 +1,3 @@
 from .yolov12_detector import YOLOv12Detector
+from .detections import Detections
 from .detection_utils import non_max_suppression, compute_iou
\ No newline at end of file
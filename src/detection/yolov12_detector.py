@@ -1,7 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from ultralytics import YOLO
-from src.utils.path_utils import load_config
+import torch
+from src.utils.path_utils import load_config, get_config_path
+from src.utils.image_utils import read_image
+from .detections import Detections
 import cv2
 import numpy as np
+import os
+import threading
+
+# Serializes TensorRT engine export so concurrent first loads don't write the same file
+_export_lock = threading.Lock()
 
 
 class YOLOv12Detector:
@@ -10,64 +19,158 @@ class YOLOv12Detector:
         self.model_config = load_config("model")
         self.dataset_config = load_config("dataset")
 
-        # Load pre-trained YOLOv12 model
-        self.model = YOLO(self.model_config["model_path"])
+        # Load pre-trained YOLOv12 model (TensorRT engine if enabled)
+        self.max_batch = self.model_config.get("max_batch", 8)
+        model_path = self._resolve_model_path()
+        self.is_engine = model_path.endswith(".engine")
+        self.model = YOLO(model_path, task="detect")
         self.conf_thres = self.model_config["conf_threshold"]
         self.iou_thres = self.model_config["iou_threshold"]
         self.class_names = self.dataset_config["names"]
 
-    def detect(self, image_path: str) -> tuple[np.ndarray, list]:
+        # Run on GPU with FP16 inference when CUDA is available
+        self.device = 0 if torch.cuda.is_available() else "cpu"
+        self.half = torch.cuda.is_available()
+
+    def _resolve_model_path(self) -> str:
+        """
+        Get path of the weights to load, exporting a TensorRT engine on first run if enabled
+        :return: Path of .pt weights or .engine file
+        """
+        model_path = self.model_config["model_path"]
+        if not self.model_config.get("tensorrt", False) or not torch.cuda.is_available():
+            return model_path
+
+        engine_path = os.path.splitext(model_path)[0] + ".engine"
+        with _export_lock:
+            if not os.path.exists(engine_path):
+                # Dynamic batch dimension up to max_batch so detect_batch can submit several images per call
+                export_args = {
+                    "format": "engine",
+                    "imgsz": self.model_config["imgsz"],
+                    "device": 0,
+                    "dynamic": True,
+                    "batch": self.max_batch
+                }
+                if self.model_config.get("int8", False):
+                    # INT8 calibration uses images from the dataset config
+                    export_args.update(int8=True, data=get_config_path("dataset"))
+                else:
+                    export_args.update(half=True)
+                engine_path = YOLO(model_path).export(**export_args)
+
+        return str(engine_path)
+
+    def warmup(self):
+        """Run one dummy inference so CUDA kernels and buffers are ready before real requests"""
+        imgsz = self.model_config["imgsz"]
+        self._predict(np.zeros((imgsz, imgsz, 3), dtype=np.uint8))
+
+    def detect(self, image_path: str) -> tuple[np.ndarray, Detections]:
         """
         Perform object detection on input image
         :param image_path: Path to input image
-        :return: (original image array, detection results list)
+        :return: (original image array, detection results)
         """
         # Read image
-        img = cv2.imread(image_path)
-        if img is None:
-            raise ValueError(f"Failed to read image from: {image_path}")
+        img = self._read_image(image_path)
 
-        # Model inference
-        results = self.model(
-            img,
+        # Model inference (single image -> single result)
+        results = self._predict(img)
+
+        # Parse detection results
+        detections = self._parse_result(results[0]) if results else Detections()
+
+        return img, detections
+
+    def detect_batch(self, image_paths: list, batch_size: int = None) -> list[tuple[np.ndarray, Detections]]:
+        """
+        Perform object detection on multiple images with batched inference calls
+        :param image_paths: List of paths to input images
+        :param batch_size: Maximum number of images per inference call (default: max_batch from model config)
+        :return: List of (original image array, detection results), in input order
+        """
+        return list(self.iter_detect_batch(image_paths, batch_size))
+
+    def iter_detect_batch(self, image_paths: list, batch_size: int = None):
+        """
+        Perform object detection on multiple images, reading and predicting one batch at a time
+        :param image_paths: List of paths to input images
+        :param batch_size: Maximum number of images per inference call (default: max_batch from model config)
+        :return: Generator of (original image array, detection results), in input order
+        """
+        if batch_size is None:
+            batch_size = self.max_batch
+        if self.is_engine:
+            # TensorRT engines are exported with a batch profile capped at max_batch
+            batch_size = min(batch_size, self.max_batch)
+
+        for start in range(0, len(image_paths), batch_size):
+            batch_paths = image_paths[start:start + batch_size]
+
+            # Read images in parallel (decoding releases the GIL)
+            with ThreadPoolExecutor() as executor:
+                imgs = list(executor.map(self._read_image, batch_paths))
+
+            # Batched model inference (one result per input image)
+            results = self._predict(imgs)
+
+            for img, r in zip(imgs, results):
+                yield img, self._parse_result(r)
+
+    def _predict(self, source) -> list:
+        """
+        Run model inference with the configured thresholds and device
+        :param source: Image array or list of image arrays
+        :return: Ultralytics results list (one per image)
+        """
+        return self.model(
+            source,
             conf=self.conf_thres,
             iou=self.iou_thres,
-            imgsz=self.model_config["imgsz"]
+            imgsz=self.model_config["imgsz"],
+            device=self.device,
+            half=self.half
         )
 
-        # Parse detection results
-        detections = []
-        for r in results:
-            boxes = r.boxes
-            for box in boxes:
-                # Extract bounding box coordinates
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
-                # Extract class info and confidence
-                cls_id = int(box.cls[0])
-                cls_name = self.class_names[cls_id]
-                conf = float(box.conf[0])
-
-                detections.append({
-                    "bbox": [x1, y1, x2, y2],
-                    "class_id": cls_id,
-                    "class_name": cls_name,
-                    "confidence": conf
-                })
+    def _read_image(self, image_path: str) -> np.ndarray:
+        """
+        Read input image from file
+        :param image_path: Path to input image
+        :return: Image array (BGR)
+        """
+        img = read_image(image_path)
+        if img is None:
+            raise ValueError(f"Failed to read image from: {image_path}")
+        return img
 
-        return img, detections
+    def _parse_result(self, result) -> Detections:
+        """
+        Convert a single ultralytics result into detection arrays
+        :param result: Ultralytics result for one image
+        :return: Detection results
+        """
+        # Transfer all boxes to CPU at once instead of syncing per box
+        boxes = result.boxes
+        class_ids = boxes.cls.cpu().numpy().astype(np.int32)
+
+        return Detections(
+            bboxes=boxes.xyxy.cpu().numpy().astype(np.int32),
+            class_ids=class_ids,
+            confidences=boxes.conf.cpu().numpy().astype(np.float32),
+            class_names=[self.class_names[cls_id] for cls_id in class_ids.tolist()]
+        )
 
-    def draw_detections(self, img: np.ndarray, detections: list) -> np.ndarray:
+    def draw_detections(self, img: np.ndarray, detections: Detections) -> np.ndarray:
         """
         Draw bounding boxes and labels on image
         :param img: Original image array
-        :param detections: Detection results list
+        :param detections: Detection results
         :return: Image with drawn detections
         """
-        for det in detections:
-            x1, y1, x2, y2 = det["bbox"]
-            cls_name = det["class_name"]
-            conf = det["confidence"]
-
+        for (x1, y1, x2, y2), cls_name, conf in zip(
+            detections.bboxes.tolist(), detections.class_names, detections.confidences.tolist()
+        ):
             # Draw bounding box
             cv2.rectangle(img, (x1, y1), (x2, y2), (0, 255, 0), 2)
             # Draw label
@@ -81,4 +184,4 @@ class YOLOv12Detector:
                 2
             )
 
-        return img
\ No newline at end of file
+        return img
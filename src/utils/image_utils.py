@@ -0,0 +1,53 @@
+import cv2
+import io
+import numpy as np
+from PIL import Image
+from typing import Optional
+
+# Optional libjpeg-turbo decoder for faster JPEG reads
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_GRAY, TJSAMP_GRAY
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, RuntimeError, OSError):
+    _turbo_jpeg = None
+
+JPEG_EXTENSIONS = (".jpg", ".jpeg")
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+def read_image(image_path: str, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+    """
+    Read image from file, decoding JPEGs with TurboJPEG when it is installed
+    :param image_path: Path to image file
+    :param flags: cv2.imread flag (IMREAD_COLOR or IMREAD_UNCHANGED)
+    :return: Image array, or None if the file cannot be read (same as cv2.imread)
+    """
+    if _turbo_jpeg is not None and image_path.lower().endswith(JPEG_EXTENSIONS):
+        try:
+            with open(image_path, "rb") as f:
+                data = f.read()
+            if flags == cv2.IMREAD_UNCHANGED:
+                # Keep single-channel JPEGs single-channel, as cv2.IMREAD_UNCHANGED does
+                _, _, subsample, _ = _turbo_jpeg.decode_header(data)
+                if subsample == TJSAMP_GRAY:
+                    return _turbo_jpeg.decode(data, pixel_format=TJPF_GRAY)[:, :, 0]
+                return _turbo_jpeg.decode(data, pixel_format=TJPF_BGR)
+            # cv2.imread rotates images by their EXIF orientation (except with IMREAD_UNCHANGED)
+            # and TurboJPEG does not, so leave rotated images to OpenCV
+            if _exif_orientation(data) == 1:
+                return _turbo_jpeg.decode(data, pixel_format=TJPF_BGR)
+        except OSError:
+            # Unreadable or corrupt file: let OpenCV handle it
+            pass
+
+    return cv2.imread(image_path, flags)
+
+
+def _exif_orientation(data: bytes) -> int:
+    """
+    Read EXIF orientation tag of an encoded image (header only, no decoding)
+    :param data: Encoded image bytes
+    :return: Orientation value (1 = upright, also returned when the tag is missing)
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        return img.getexif().get(EXIF_ORIENTATION_TAG, 1)
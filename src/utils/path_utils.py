@@ -1,23 +1,44 @@
+import functools
 import yaml
 import os
 from typing import Dict
 
+# Prefer the libyaml-backed loader when available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-def load_config(config_name: str) -> Dict:
+
+def get_config_path(config_name: str) -> str:
     """
-    Load configuration file from configs/ directory
+    Get path of configuration file in configs/ directory
     :param config_name: Name of config file (dataset/model/web_config)
-    :return: Configuration dictionary
+    :return: Absolute path of config file
     """
     # Get project root path
     root_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     config_path = os.path.join(root_path, "configs", f"{config_name}.yaml")
 
+    # The shipped config files use the .ymal extension; accept both
+    if not os.path.exists(config_path):
+        alt_path = os.path.join(root_path, "configs", f"{config_name}.ymal")
+        if os.path.exists(alt_path):
+            return alt_path
+    return config_path
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(config_name: str) -> Dict:
+    """
+    Load configuration file from configs/ directory (parsed once, then cached)
+    :param config_name: Name of config file (dataset/model/web_config)
+    :return: Configuration dictionary (shared between callers, do not modify)
+    """
+    config_path = get_config_path(config_name)
+
     try:
         with open(config_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
         return config
     except FileNotFoundError:
         raise FileNotFoundError(f"Config file not found: {config_path}")
     except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML format in config file: {e}")
\ No newline at end of file
+        raise ValueError(f"Invalid YAML format in config file: {e}")
@@ -5,17 +5,131 @@ from src.depth_analysis import (
     DimensionCalculator,
     RoughnessEstimator,
     depth_img_read,
-    preprocess_depth_img
+    preprocess_depth_img,
+    analyze_detections
 )
+from concurrent.futures import ThreadPoolExecutor
 import cv2
-import uuid
+import functools
+import hashlib
+import json
 import os
+import threading
 
-# Initialize core modules
-detector = YOLOv12Detector()
+# Initialize core modules (the detector is loaded lazily, see get_detector)
 dim_calc = DimensionCalculator()
 roughness_est = RoughnessEstimator()
 
+# Background JPEG encoding/writing of result images (pending writes by file name)
+_writer = ThreadPoolExecutor(max_workers=2)
+_pending_writes = {}
+_pending_lock = threading.Lock()
+
+_detector_lock = threading.Lock()
+
+
+def get_detector():
+    """
+    Load the detector on first use and warm it up, then reuse it for all requests
+    :return: Shared YOLOv12Detector instance
+    """
+    # Concurrent first requests wait for a single load (and engine export) instead of racing
+    with _detector_lock:
+        return _load_detector()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_detector():
+    """
+    Create and warm up the detector (called once, see get_detector)
+    :return: YOLOv12Detector instance
+    """
+    detector = YOLOv12Detector()
+    detector.warmup()
+    return detector
+
+
+def save_result_image(filename, img):
+    """
+    Write a result image to the result folder in the background
+    :param filename: Result image file name
+    :param img: Image array to write
+    """
+    submit_result_write(filename, write_image_atomic, img)
+
+
+def save_results_json(filename, results):
+    """
+    Write per-object analysis results of one upload to the result folder in the background
+    :param filename: Results file name
+    :param results: Per-object results list
+    """
+    submit_result_write(filename, write_json_atomic, results)
+
+
+def submit_result_write(filename, write_fn, data):
+    """
+    Queue a background write of a result file, tracked until it finishes
+    :param filename: Result file name
+    :param write_fn: Function writing data to a path (write_image_atomic / write_json_atomic)
+    :param data: Data to write
+    """
+    path = os.path.join(app.config["RESULT_FOLDER"], filename)
+    with _pending_lock:
+        # Identical uploads produce the same file name: one in-flight write is enough
+        if filename in _pending_writes:
+            return
+        future = _writer.submit(write_fn, path, data)
+        _pending_writes[filename] = future
+    future.add_done_callback(functools.partial(_result_write_done, filename))
+
+
+def _result_write_done(filename, future):
+    """
+    Stop tracking a finished background write and log it if it failed
+    :param filename: Result file name
+    :param future: Finished write future
+    """
+    _pending_writes.pop(filename, None)
+    error = future.exception()
+    if error is not None:
+        app.logger.error("Failed to write result file %s: %s", filename, error)
+
+
+def temp_path(path):
+    """
+    Get a temporary path next to path, unique per process and thread
+    :param path: Destination file path
+    :return: Temporary file path (keeps the extension)
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+
+
+def write_image_atomic(path, img):
+    """
+    Encode and write an image via a temporary file, so readers never see a partial file
+    :param path: Destination image path
+    :param img: Image array to write
+    """
+    # The temporary file keeps the extension so cv2.imwrite picks the right encoder
+    tmp_path = temp_path(path)
+    if not cv2.imwrite(tmp_path, img):
+        raise IOError(f"Failed to write image to: {tmp_path}")
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path, data):
+    """
+    Write data as JSON via a temporary file, so readers never see a partial file
+    :param path: Destination JSON path
+    :param data: JSON-serializable data
+    """
+    tmp_path = temp_path(path)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
 
 @app.route('/')
 def index():
@@ -30,69 +144,150 @@ def predict():
     if 'image' not in request.files or 'depth' not in request.files:
         return "Please upload both RGB image and depth image", 400
 
-    img_file = request.files['image']
-    depth_file = request.files['depth']
+    # Multiple RGB/depth pairs may be uploaded at once (matched by upload order)
+    img_files = request.files.getlist('image')
+    depth_files = request.files.getlist('depth')
 
     # Check if filenames are empty
-    if img_file.filename == '' or depth_file.filename == '':
+    if any(f.filename == '' for f in img_files + depth_files):
         return "Empty filename is not allowed", 400
 
-    # Save uploaded files with unique IDs to avoid overwriting
-    img_name = f"{uuid.uuid4()}_{img_file.filename}"
-    depth_name = f"{uuid.uuid4()}_{depth_file.filename}"
+    if len(img_files) != len(depth_files):
+        return "Please upload the same number of RGB images and depth images", 400
+
+    samples = [None] * len(img_files)
+    pending = []
+    for i, (img_file, depth_file) in enumerate(zip(img_files, depth_files)):
+        img_data = img_file.read()
+        depth_data = depth_file.read()
+        key = upload_key(img_data, depth_data)
+
+        # Reuse results of a previously processed identical upload
+        cached = load_cached_sample(key)
+        if cached is not None:
+            samples[i] = cached
+            continue
+
+        # Save uploaded files named by content hash
+        img_path = os.path.join(
+            app.config["UPLOAD_FOLDER"], f"{key}_image{os.path.splitext(img_file.filename)[1]}"
+        )
+        depth_path = os.path.join(
+            app.config["UPLOAD_FOLDER"], f"{key}_depth{os.path.splitext(depth_file.filename)[1]}"
+        )
+        with open(img_path, "wb") as f:
+            f.write(img_data)
+        with open(depth_path, "wb") as f:
+            f.write(depth_data)
+        pending.append((i, key, img_path, depth_path))
+
+    # Perform batched object detection on uploads without cached results
+    batch_results = []
+    if pending:
+        batch_results = get_detector().detect_batch([img_path for _, _, img_path, _ in pending])
+
+    for (i, key, _, depth_path), (img, detections) in zip(pending, batch_results):
+        samples[i] = analyze_sample(img, detections, depth_path, key)
+
+    # Render result page
+    return render_template('result.html', samples=samples)
 
-    img_path = os.path.join(app.config["UPLOAD_FOLDER"], img_name)
-    depth_path = os.path.join(app.config["UPLOAD_FOLDER"], depth_name)
 
-    img_file.save(img_path)
-    depth_file.save(depth_path)
+def upload_key(img_data, depth_data):
+    """
+    Compute content hash identifying an uploaded RGB/depth pair
+    :param img_data: RGB image file bytes
+    :param depth_data: Depth image file bytes
+    :return: Hex digest used as file name prefix
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(len(img_data).to_bytes(8, "little"))
+    hasher.update(img_data)
+    hasher.update(depth_data)
+    return hasher.hexdigest()
 
-    # Perform object detection
-    img, detections = detector.detect(img_path)
 
+def load_cached_sample(key):
+    """
+    Load analysis results of a previously processed upload
+    :param key: Upload content hash
+    :return: Cached sample dictionary, or None if not processed yet
+    """
+    result_img_name = f"{key}_result.jpg"
+    depth_result_name = f"{key}_depth.jpg"
+    results_path = os.path.join(app.config["RESULT_FOLDER"], f"{key}_results.json")
+
+    # All result files are written independently (and atomically), so a cache hit needs all of them;
+    # otherwise a failed or interrupted image write would be served as a page with missing images
+    for path in (
+        results_path,
+        os.path.join(app.config["RESULT_FOLDER"], result_img_name),
+        os.path.join(app.config["RESULT_FOLDER"], depth_result_name)
+    ):
+        if not os.path.exists(path):
+            return None
+
+    with open(results_path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    return {
+        "result_img": result_img_name,
+        "depth_img": depth_result_name,
+        "results": results
+    }
+
+
+def analyze_sample(img, detections, depth_path, key):
+    """
+    Analyze detections of one RGB/depth pair and save its result images
+    :param img: Original image array
+    :param detections: Detection results
+    :param depth_path: Path to the uploaded depth image
+    :param key: Upload content hash used to name result files
+    :return: Dictionary with result image names and per-object results
+    """
     # Process depth image
     depth_img = depth_img_read(depth_path)
     depth_img, depth_normalized = preprocess_depth_img(depth_img)
 
-    # Analyze each detected object
-    results = []
-    for det in detections:
-        bbox = det["bbox"]
-        # Calculate dimensions
-        width, height, depth = dim_calc.calculate_dimensions(depth_img, bbox)
-        # Estimate roughness
-        roughness = roughness_est.estimate_roughness(depth_img, bbox)
+    # Analyze all detected objects
+    analyses = analyze_detections(depth_img, detections.bboxes, dim_calc, roughness_est)
 
+    results = []
+    for cls_name, conf, analysis in zip(detections.class_names, detections.confidences.tolist(), analyses):
         results.append({
-            "class_name": det["class_name"],
-            "confidence": round(det["confidence"], 2),
-            "width": round(width, 3),
-            "height": round(height, 3),
-            "depth": round(depth, 3),
-            "roughness": round(roughness, 3)
+            "class_name": cls_name,
+            "confidence": round(conf, 2),
+            "width": round(analysis["width"], 3),
+            "height": round(analysis["height"], 3),
+            "depth": round(analysis["depth"], 3),
+            "roughness": round(analysis["roughness"], 3)
         })
 
     # Save detection result image
-    img_with_boxes = detector.draw_detections(img, detections)
-    result_img_name = f"{uuid.uuid4()}_result.jpg"
-    result_img_path = os.path.join(app.config["RESULT_FOLDER"], result_img_name)
-    cv2.imwrite(result_img_path, img_with_boxes)
+    img_with_boxes = get_detector().draw_detections(img, detections)
+    result_img_name = f"{key}_result.jpg"
+    save_result_image(result_img_name, img_with_boxes)
 
     # Save depth visualization image
-    depth_result_name = f"{uuid.uuid4()}_depth.jpg"
-    depth_result_path = os.path.join(app.config["RESULT_FOLDER"], depth_result_name)
-    cv2.imwrite(depth_result_path, depth_normalized)
+    depth_result_name = f"{key}_depth.jpg"
+    save_result_image(depth_result_name, depth_normalized)
 
-    # Render result page
-    return render_template(
-        'result.html',
-        result_img=result_img_name,
-        depth_img=depth_result_name,
-        results=results
-    )
+    # Save analysis results so identical uploads can skip processing
+    save_results_json(f"{key}_results.json", results)
+
+    return {
+        "result_img": result_img_name,
+        "depth_img": depth_result_name,
+        "results": results
+    }
 
 
 @app.route('/results/<filename>')
 def get_result(filename):
     """Serve result images to web page"""
+    # Wait for the image if it is still being written in the background
+    future = _pending_writes.get(filename)
+    if future is not None:
+        # exception() waits without raising; a failed write was already logged and gives a 404 below
+        future.exception()
     return send_from_directory(app.config["RESULT_FOLDER"], filename)
\ No newline at end of file